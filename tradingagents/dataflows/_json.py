@@ -0,0 +1,28 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+
+def dumps(obj) -> str:
+    """Serialize obj to a JSON string, handling numpy values and datetimes."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY,
+        ).decode()
+    return json.dumps(obj, default=str)
+
+
+def loads(data):
+    """Deserialize a JSON str or bytes, accepting everything json.loads does."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the standard library, e.g. it rejects NaN and Infinity
+            pass
+    return json.loads(data)
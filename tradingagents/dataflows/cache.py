@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Any, Optional
+
+import pandas as pd
+
+from . import _json
+from .config import get_dataflows_config
+
+
+def write_atomic(path: str, write_fn) -> bool:
+    """
+    Write a file through write_fn(tmp_path) and move it into place, so readers never see a partial file.
+    Best effort: a failed write (disk full, permissions) is logged and False returned, since losing a
+    cache write must not lose data that was fetched fine.
+    """
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        write_fn(tmp_path)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        print(f"Failed to write cache entry {path}: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+class FileCache:
+    """
+    On-disk cache for results fetched from remote data sources.
+    Entries live under <cache_dir>/<ticker>/<data_type>/<hash>.json and expire after ttl_seconds.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: int = 90 * 86400):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def make_key(ticker, start_date, end_date, data_type, **kwargs) -> str:
+        """Build a cache key for a (ticker, date range, data type) query."""
+        # stdlib json keeps keys stable whether or not orjson is installed
+        digest = hashlib.md5(
+            json.dumps(
+                [ticker, start_date, end_date, data_type, sorted(kwargs.items())],
+                default=str,
+            ).encode()
+        ).hexdigest()
+        safe_ticker = re.sub(r"[^\w.-]", "_", str(ticker))
+        return os.path.join(safe_ticker, data_type, digest)
+
+    def _path(self, key: str, ext: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{ext}")
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """Read a cached value; expired entries are only returned when allow_stale is set."""
+        path = self._path(key, "json")
+        try:
+            with open(path, "rb") as f:
+                entry = _json.loads(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+        if not allow_stale and time.time() - entry["ts"] > self.ttl_seconds:
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any) -> None:
+        def write(tmp_path):
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(_json.dumps({"ts": time.time(), "value": value}))
+
+        write_atomic(self._path(key, "json"), write)
+
+    def get_frame(self, key: str, allow_stale: bool = False) -> Optional[pd.DataFrame]:
+        """Read a cached DataFrame, indexed by its first column."""
+        path = self._path(key, "csv")
+        try:
+            if not allow_stale and time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            return pd.read_csv(path, index_col=0, parse_dates=True)
+        except FileNotFoundError:
+            return None
+
+    def frame_cached_at(self, key: str) -> Optional[float]:
+        """Return when a cached DataFrame was written, as a unix timestamp."""
+        try:
+            return os.path.getmtime(self._path(key, "csv"))
+        except FileNotFoundError:
+            return None
+
+    def set_frame(self, key: str, df: pd.DataFrame) -> None:
+        write_atomic(self._path(key, "csv"), lambda tmp_path: df.to_csv(tmp_path))
+
+
+def get_file_cache() -> FileCache:
+    """Return a FileCache rooted in the configured data cache directory."""
+    config = get_dataflows_config()
+    return FileCache(
+        os.path.join(config.data_cache_dir, "remote"),
+        config.cache_ttl_seconds,
+    )
+
+
+def is_closed_range(end_date: str) -> bool:
+    """Only ranges that ended before today are safe to cache; today's data is still changing."""
+    return pd.Timestamp(end_date).normalize() < pd.Timestamp.today().normalize()
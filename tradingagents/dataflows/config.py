@@ -1,25 +1,45 @@
 import tradingagents.default_config as default_config
-from typing import Dict, Optional
+from dataclasses import dataclass, fields
+from typing import Dict, Mapping, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class DataflowsConfig:
+    """Typed, read-only view of the settings the dataflows read on every call."""
+
+    data_dir: str
+    data_cache_dir: str
+    cache_ttl_seconds: int
+    backend_url: str
+    quick_think_llm: str
+
+    @classmethod
+    def from_mapping(cls, config: Mapping) -> "DataflowsConfig":
+        return cls(**{field.name: config[field.name] for field in fields(cls)})
+
 
 # Use default config but allow it to be overridden
 _config: Optional[Dict] = None
+_dataflows_config: Optional[DataflowsConfig] = None
 DATA_DIR: Optional[str] = None
 
 
 def initialize_config():
     """Initialize the configuration with default values."""
-    global _config, DATA_DIR
+    global _config, _dataflows_config, DATA_DIR
     if _config is None:
         _config = default_config.DEFAULT_CONFIG.copy()
+        _dataflows_config = DataflowsConfig.from_mapping(_config)
         DATA_DIR = _config["data_dir"]
 
 
 def set_config(config: Dict):
     """Update the configuration with custom values."""
-    global _config, DATA_DIR
+    global _config, _dataflows_config, DATA_DIR
     if _config is None:
         _config = default_config.DEFAULT_CONFIG.copy()
     _config.update(config)
+    _dataflows_config = DataflowsConfig.from_mapping(_config)
     DATA_DIR = _config["data_dir"]
 
 
@@ -30,5 +50,12 @@ def get_config() -> Dict:
     return _config.copy()
 
 
+def get_dataflows_config() -> DataflowsConfig:
+    """Get the current dataflow settings without copying the configuration."""
+    if _dataflows_config is None:
+        initialize_config()
+    return _dataflows_config
+
+
 # Initialize with default config
 initialize_config()
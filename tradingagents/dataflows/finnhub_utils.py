@@ -1,6 +1,7 @@
-import json
 import os
 
+from . import _json
+
 
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
     """
@@ -25,8 +26,8 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    with open(data_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(data_path, "rb") as f:
+        data = _json.loads(f.read())
 
     # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
     filtered_data = {}
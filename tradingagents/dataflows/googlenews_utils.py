@@ -1,6 +1,6 @@
+import atexit
 import json
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
 import time
 import random
@@ -8,36 +8,74 @@ from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
     retry_if_result,
 )
 
+from .cache import FileCache, get_file_cache, is_closed_range
+from .utils import circuit_breaker, retry_transient
+
+
+# shared session so consecutive page requests reuse the same keep-alive connection
+_session = requests.Session()
+_last_request_time = float("-inf")
+
+
+@atexit.register
+def close_session():
+    """Close the shared session so its keep-alive sockets don't outlive the process."""
+    _session.close()
+
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
     return response.status_code == 429
 
 
+@retry_transient()
 @retry(
     retry=(retry_if_result(is_rate_limited)),
     wait=wait_exponential(multiplier=1, min=4, max=60),
     stop=stop_after_attempt(5),
 )
 def make_request(url, headers):
-    """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
+    """Make a request with retry logic for rate limiting and transient network errors"""
+    global _last_request_time
+    # Random spacing between requests to avoid detection; only sleep for the part
+    # of it that has not already elapsed since the previous request
+    delay = random.uniform(2, 6) - (time.monotonic() - _last_request_time)
+    if delay > 0:
+        time.sleep(delay)
+    response = _session.get(url, headers=headers)
+    _last_request_time = time.monotonic()
     return response
 
 
+def _get_stale_results(cache, cache_key):
+    return cache.get(cache_key, allow_stale=True) or []
+
+
 def getNewsData(query, start_date, end_date):
     """
     Scrape Google News search results for a given query and date range.
     query: str - search query
     start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
     end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
+    returns: list of dicts with link, title, snippet, date and source keys
     """
+    cache = get_file_cache()
+    cache_key = FileCache.make_key(query, start_date, end_date, "google_news")
+    cached_results = cache.get(cache_key)
+    if cached_results is not None:
+        return cached_results
+    cacheable = is_closed_range(end_date)
+
+    if circuit_breaker.is_open("google_news"):
+        print("Google News is failing, skipping the request until it recovers")
+        return _get_stale_results(cache, cache_key)
+
+    # bs4 is only needed once a search actually has to be scraped
+    from bs4 import BeautifulSoup
+
     if "-" in start_date:
         start_date = datetime.strptime(start_date, "%Y-%m-%d")
         start_date = start_date.strftime("%m/%d/%Y")
@@ -65,6 +103,14 @@ def getNewsData(query, start_date, end_date):
 
         try:
             response = make_request(url, headers)
+        except Exception as e:
+            print(f"Failed after multiple retries: {e}")
+            circuit_breaker.record_failure("google_news")
+            cacheable = False
+            break
+        circuit_breaker.record_success("google_news")
+
+        try:
             soup = BeautifulSoup(response.content, "html.parser")
             results_on_page = soup.select("div.SoaBEf")
 
@@ -102,7 +148,15 @@ def getNewsData(query, start_date, end_date):
             page += 1
 
         except Exception as e:
-            print(f"Failed after multiple retries: {e}")
+            print(f"Failed to parse results page: {e}")
+            cacheable = False
             break
 
+    if not news_results:
+        # nothing scraped, fall back to an expired cached copy if there is one
+        return _get_stale_results(cache, cache_key)
+
+    if cacheable:
+        cache.set(cache_key, news_results)
+
     return news_results
@@ -4,16 +4,17 @@ from .yfin_utils import *
 from .stockstats_utils import *
 from .googlenews_utils import *
 from .finnhub_utils import get_data_in_range
+from .cache import FileCache, get_file_cache, is_closed_range
+from .utils import CircuitOpenError, singleflight, ttl_cache
 from dateutil.relativedelta import relativedelta
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import atexit
 import json
 import os
 import pandas as pd
 from tqdm import tqdm
-import yfinance as yf
-from openai import OpenAI
-from .config import get_config, set_config, DATA_DIR
+from .config import get_dataflows_config, set_config, DATA_DIR
 
 
 def get_finnhub_news(
@@ -141,6 +142,19 @@ def get_finnhub_company_insider_transactions(
     )
 
 
+@ttl_cache(maxsize=16, ttl=3600)
+@singleflight
+def _load_simfin_statement(data_path: str) -> pd.DataFrame:
+    """Read a SimFin bulk statement file once; every ticker lookup reuses the parsed frame."""
+    df = pd.read_csv(data_path, sep=";")
+
+    # Convert date strings to datetime objects and remove any time components
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+    return df
+
+
 def get_simfin_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -158,11 +172,7 @@ def get_simfin_balance_sheet(
         "us",
         f"us-balance-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    df = _load_simfin_statement(data_path)
 
     # Convert the current date to datetime and normalize
     curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
@@ -205,11 +215,7 @@ def get_simfin_cashflow(
         "us",
         f"us-cashflow-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    df = _load_simfin_statement(data_path)
 
     # Convert the current date to datetime and normalize
     curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
@@ -252,11 +258,7 @@ def get_simfin_income_statements(
         "us",
         f"us-income-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    df = _load_simfin_statement(data_path)
 
     # Convert the current date to datetime and normalize
     curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
@@ -511,39 +513,35 @@ def get_stock_stats_indicators_window(
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
+    # compute the indicator once over the whole window instead of once per day
+    try:
+        indicator_values = StockstatsUtils.get_stock_stats_window(
+            symbol,
+            indicator,
+            before.strftime("%Y-%m-%d"),
+            end_date,
+            os.path.join(DATA_DIR, "market_data", "price_data"),
+            online=online,
+        )
+    except Exception as e:
+        print(
+            f"Error getting stockstats indicator data for indicator {indicator} from {before.strftime('%Y-%m-%d')} to {end_date}: {e}"
+        )
+        return (
+            f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
+            f"N/A: data unavailable: {e}"
         )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
-
-        ind_string = ""
-        while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-                )
-
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
-    else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-            )
 
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
+    ind_string = ""
+    while curr_date >= before:
+        date_str = curr_date.strftime("%Y-%m-%d")
+        if date_str in indicator_values:
+            ind_string += f"{date_str}: {indicator_values[date_str]}\n"
+        elif online:
+            # the online report also lists non-trading days
+            ind_string += f"{date_str}: N/A: Not a trading day (weekend or holiday)\n"
 
-            curr_date = curr_date - relativedelta(days=1)
+        curr_date = curr_date - relativedelta(days=1)
 
     result_str = (
         f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
@@ -584,34 +582,35 @@ def get_stockstats_indicator(
     return str(indicator_value)
 
 
+@ttl_cache(maxsize=32, ttl=3600)
+@singleflight
+def _load_yfin_price_data(data_path: str):
+    """Read a YFin price file once, along with its trading dates parsed to datetime64 for range filters."""
+    data = pd.read_csv(data_path)
+    trade_dates = pd.to_datetime(data["Date"].str[:10])
+    return data, trade_dates
+
+
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     curr_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
 ) -> str:
     # calculate past days
-    date_obj = datetime.strptime(curr_date, "%Y-%m-%d")
-    before = date_obj - relativedelta(days=look_back_days)
-    start_date = before.strftime("%Y-%m-%d")
+    end_ts = pd.Timestamp(curr_date)
+    start_ts = end_ts - pd.Timedelta(days=look_back_days)
+    start_date = start_ts.strftime("%Y-%m-%d")
 
     # read in data
-    data = pd.read_csv(
+    data, trade_dates = _load_yfin_price_data(
         os.path.join(
             DATA_DIR,
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
         )
     )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
     # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    filtered_data = data[(trade_dates >= start_ts) & (trade_dates <= end_ts)]
 
     # Set pandas display options to show the full DataFrame
     with pd.option_context(
@@ -625,6 +624,36 @@ def get_YFin_data_window(
     )
 
 
+def _fetch_yfin_history(source, cache, cache_key, symbol, start_date, end_date):
+    """
+    Fetch price history from a single source, as (data, stale_since).
+    data is None when the source has nothing to offer; stale_since is when an expired copy was cached.
+    """
+    if source == "cache":
+        return cache.get_frame(cache_key), None
+    if source == "cache_stale":
+        # read the cache time first, so it is known for whatever copy get_frame returns
+        stale_since = cache.frame_cached_at(cache_key)
+        if stale_since is None:
+            return None, None
+        return cache.get_frame(cache_key, allow_stale=True), stale_since
+
+    # Fetch historical data for the specified date range
+    try:
+        data = get_ticker_history(symbol.upper(), start=start_date, end=end_date)
+    except CircuitOpenError:
+        return None, None
+
+    # Remove timezone info from index for cleaner output
+    if data.index.tz is not None:
+        data.index = data.index.tz_localize(None)
+
+    if not data.empty and is_closed_range(end_date):
+        cache.set_frame(cache_key, data)
+
+    return data, None
+
+
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -634,11 +663,28 @@ def get_YFin_data_online(
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
-    # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
+    cache = get_file_cache()
+    cache_key = FileCache.make_key(symbol.upper(), start_date, end_date, "yfin_history")
 
-    # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
+    # try each source in turn: the cache, Yahoo Finance, then an expired cached copy
+    data = None
+    last_error = None
+    for source in ("cache", "yfinance", "cache_stale"):
+        try:
+            data, stale_since = _fetch_yfin_history(
+                source, cache, cache_key, symbol, start_date, end_date
+            )
+        except Exception as e:
+            print(f"Fetching {symbol} price history from {source} failed: {e}")
+            last_error = e
+            continue
+        if data is not None:
+            break
+
+    if data is None:
+        if last_error is not None:
+            raise last_error
+        return f"Yahoo Finance is currently unavailable, no data fetched for symbol '{symbol}' between {start_date} and {end_date}"
 
     # Check if data is empty
     if data.empty:
@@ -646,10 +692,6 @@ def get_YFin_data_online(
             f"No data found for symbol '{symbol}' between {start_date} and {end_date}"
         )
 
-    # Remove timezone info from index for cleaner output
-    if data.index.tz is not None:
-        data.index = data.index.tz_localize(None)
-
     # Round numerical values to 2 decimal places for cleaner display
     numeric_columns = ["Open", "High", "Low", "Close", "Adj Close"]
     for col in numeric_columns:
@@ -662,7 +704,12 @@ def get_YFin_data_online(
     # Add header information
     header = f"# Stock data for {symbol.upper()} from {start_date} to {end_date}\n"
     header += f"# Total records: {len(data)}\n"
-    header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    if stale_since is not None:
+        # Yahoo Finance could not be reached, make it clear the data may be outdated
+        cached_at = datetime.fromtimestamp(stale_since)
+        header += f"# Data served from expired cache, cached on: {cached_at.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    else:
+        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
 
     return header + csv_string
 
@@ -673,7 +720,7 @@ def get_YFin_data(
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
     # read in data
-    data = pd.read_csv(
+    data, trade_dates = _load_yfin_price_data(
         os.path.join(
             DATA_DIR,
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
@@ -685,29 +732,46 @@ def get_YFin_data(
             f"Get_YFin_Data: {end_date} is outside of the data range of 2015-01-01 to 2025-03-25"
         )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
-
     # Filter data between the start and end dates (inclusive)
     filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
+        (trade_dates >= pd.Timestamp(start_date))
+        & (trade_dates <= pd.Timestamp(end_date))
     ]
 
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
-
     # remove the index from the dataframe
     filtered_data = filtered_data.reset_index(drop=True)
 
     return filtered_data
 
 
+# one client per backend so the underlying HTTP connection pool is reused across calls
+_openai_clients: Dict[str, "OpenAI"] = {}
+
+
+def _get_openai_client(backend_url: str) -> "OpenAI":
+    client = _openai_clients.get(backend_url)
+    if client is None:
+        # imported on first use, the openai package is slow to import
+        from openai import OpenAI
+
+        client = OpenAI(base_url=backend_url)
+        _openai_clients[backend_url] = client
+    return client
+
+
+@atexit.register
+def _close_openai_clients():
+    while _openai_clients:
+        _, client = _openai_clients.popitem()
+        client.close()
+
+
 def get_stock_news_openai(ticker, curr_date):
-    config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    config = get_dataflows_config()
+    client = _get_openai_client(config.backend_url)
 
     response = client.responses.create(
-        model=config["quick_think_llm"],
+        model=config.quick_think_llm,
         input=[
             {
                 "role": "system",
@@ -738,11 +802,11 @@ def get_stock_news_openai(ticker, curr_date):
 
 
 def get_global_news_openai(curr_date):
-    config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    config = get_dataflows_config()
+    client = _get_openai_client(config.backend_url)
 
     response = client.responses.create(
-        model=config["quick_think_llm"],
+        model=config.quick_think_llm,
         input=[
             {
                 "role": "system",
@@ -773,11 +837,11 @@ def get_global_news_openai(curr_date):
 
 
 def get_fundamentals_openai(ticker, curr_date):
-    config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    config = get_dataflows_config()
+    client = _get_openai_client(config.backend_url)
 
     response = client.responses.create(
-        model=config["quick_think_llm"],
+        model=config.quick_think_llm,
         input=[
             {
                 "role": "system",
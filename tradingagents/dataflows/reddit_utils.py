@@ -1,11 +1,13 @@
 import requests
 import time
-import json
-from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from typing import Annotated, Dict
 import os
-import re
+
+import pandas as pd
+
+from . import _json
+from .utils import singleflight, ttl_cache
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -49,6 +51,36 @@ ticker_to_company = {
 }
 
 
+@ttl_cache(maxsize=32, ttl=3600)
+def list_category_files(
+    category_path: Annotated[str, "Directory holding one .jsonl dump per subreddit."],
+) -> tuple:
+    """List a category's directory once instead of on every fetch."""
+    return tuple(os.listdir(category_path))
+
+
+@ttl_cache(maxsize=64, ttl=3600)
+@singleflight
+def load_posts_by_date(
+    file_path: Annotated[str, "Path to a subreddit's .jsonl dump."],
+) -> Dict[str, pd.DataFrame]:
+    """Parse a subreddit dump once and group its posts by posting date (UTC, YYYY-mm-dd)."""
+    with open(file_path, "rb") as f:
+        # skip empty lines
+        records = [_json.loads(line) for line in f if line.strip()]
+
+    if not records:
+        return {}
+
+    posts = pd.DataFrame.from_records(
+        records, columns=["created_utc", "title", "selftext", "url", "ups"]
+    )
+    posts["posted_date"] = pd.to_datetime(posts["created_utc"], unit="s").dt.strftime(
+        "%Y-%m-%d"
+    )
+    return dict(tuple(posts.groupby("posted_date", sort=False)))
+
+
 def fetch_top_from_category(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
@@ -61,75 +93,49 @@ def fetch_top_from_category(
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
-    base_path = data_path
+    category_path = os.path.join(data_path, category)
+    category_files = list_category_files(category_path)
 
     all_content = []
 
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    if max_limit < len(category_files):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
+    limit_per_subreddit = max_limit // len(category_files)
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
-        # check if data_file is a .jsonl file
+    # only .jsonl files hold subreddit posts; each dump is parsed once and shared across days
+    for data_file in category_files:
         if not data_file.endswith(".jsonl"):
             continue
+        posts_by_date = load_posts_by_date(os.path.join(category_path, data_file))
 
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
-
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
-
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+        # select only posts that are from the date
+        if date not in posts_by_date:
+            continue
+        curr_subreddit = posts_by_date[date]
+
+        # if is company_news, check that the title or the content has the company's name (query) mentioned
+        if "company" in category and query:
+            search_terms = ticker_to_company[query].split(" OR ")
+            search_terms.append(query)
+            pattern = "|".join(f"(?:{term})" for term in search_terms)
+
+            mentioned = curr_subreddit["title"].str.contains(
+                pattern, case=False, na=False
+            ) | curr_subreddit["selftext"].str.contains(pattern, case=False, na=False)
+            curr_subreddit = curr_subreddit[mentioned]
+
+        # sort by upvotes in descending order
+        curr_subreddit = curr_subreddit.sort_values(
+            "ups", ascending=False, kind="stable"
+        ).head(limit_per_subreddit)
+
+        all_content.extend(
+            curr_subreddit[["title", "selftext", "url", "ups", "posted_date"]]
+            .rename(columns={"selftext": "content", "ups": "upvotes"})
+            .to_dict("records")
+        )
 
     return all_content
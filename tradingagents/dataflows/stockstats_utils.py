@@ -1,21 +1,90 @@
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
 from typing import Annotated
 import os
-from .config import get_config
+import threading
+from .cache import write_atomic
+from .config import get_dataflows_config
+from .utils import singleflight, ttl_cache
+from .yfin_utils import download_history
+
+
+def _download_daily_bars(symbol, start_date, end_date):
+    data = download_history(
+        symbol,
+        start=start_date,
+        end=end_date,
+        multi_level_index=False,
+        progress=False,
+        auto_adjust=True,
+    )
+    return data.reset_index()
+
+
+def _read_price_history(data_file):
+    """Read the cached bars, dropping partial rows; an unreadable file counts as no cache."""
+    try:
+        data = pd.read_csv(data_file)
+    except (FileNotFoundError, pd.errors.EmptyDataError, pd.errors.ParserError):
+        return pd.DataFrame()
+    if "Date" not in data.columns:
+        return pd.DataFrame()
+
+    data["Date"] = pd.to_datetime(data["Date"], errors="coerce")
+    # a bar cut off mid-row parses with NaNs in its trailing fields
+    return data.dropna().reset_index(drop=True)
+
+
+def update_price_history(
+    symbol: Annotated[str, "ticker symbol for the company"],
+    data_file: Annotated[str, "per-symbol csv file holding the cached daily bars"],
+    start_date: Annotated[str, "start date of the history, YYYY-mm-dd"],
+    end_date: Annotated[str, "end date of the history (exclusive), YYYY-mm-dd"],
+) -> pd.DataFrame:
+    """
+    Return daily bars for [start_date, end_date), downloading only the days missing from data_file.
+    The last cached bar is re-fetched with the new ones; if its adjusted close changed
+    (a split or dividend was applied since), the whole history is downloaded again.
+    """
+    data = _read_price_history(data_file)
+
+    if data.empty:
+        data = _download_daily_bars(symbol, start_date, end_date)
+    else:
+        last_date = data["Date"].iloc[-1]
+
+        new_data = pd.DataFrame()
+        if last_date + pd.Timedelta(days=1) < pd.Timestamp(end_date):
+            new_data = _download_daily_bars(
+                symbol, last_date.strftime("%Y-%m-%d"), end_date
+            )
+        overlap = new_data[new_data["Date"] == last_date] if not new_data.empty else new_data
+
+        if not overlap.empty and not np.isclose(
+            overlap["Close"].iloc[0], data["Close"].iloc[-1]
+        ):
+            data = _download_daily_bars(symbol, start_date, end_date)
+        elif len(new_data) > len(overlap):
+            data = pd.concat([data, new_data], ignore_index=True)
+            data = data.drop_duplicates(subset="Date", keep="last")
+        else:
+            # nothing new since the last cached bar
+            return data[data["Date"] >= pd.Timestamp(start_date)].reset_index(drop=True)
+
+    data = data[data["Date"] >= pd.Timestamp(start_date)]
+    data = data.sort_values("Date", ignore_index=True)
+    write_atomic(data_file, lambda tmp_path: data.to_csv(tmp_path, index=False))
+    return data
 
 
 class StockstatsUtils:
+    # guards the shared frames, since stockstats adds indicator columns in place
+    _lock = threading.Lock()
+
     @staticmethod
-    def get_stock_stats(
+    def load_stock_data(
         symbol: Annotated[str, "ticker symbol for the company"],
-        indicator: Annotated[
-            str, "quantitative indicators based off of the stock data for the company"
-        ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
         data_dir: Annotated[
             str,
             "directory where the stock data is stored.",
@@ -25,9 +94,17 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
-        data = None
+        """
+        Load the price history of a symbol wrapped as a stockstats frame indexed by trading date.
+        Frames stay in memory for the day, so later lookups also reuse the indicator columns already computed.
+        """
+        as_of = pd.Timestamp.today().strftime("%Y-%m-%d")
+        return StockstatsUtils._load_stock_data(symbol, data_dir, online, as_of)
 
+    @staticmethod
+    @ttl_cache(maxsize=32, ttl=86400)
+    @singleflight
+    def _load_stock_data(symbol, data_dir, online, as_of):
         if not online:
             try:
                 data = pd.read_csv(
@@ -37,12 +114,12 @@ class StockstatsUtils:
                     )
                 )
                 df = wrap(data)
+                df.index = pd.DatetimeIndex(pd.to_datetime(df["Date"].str[:10]))
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
         else:
             # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
+            today_date = pd.Timestamp(as_of)
 
             end_date = today_date
             start_date = today_date - pd.DateOffset(years=15)
@@ -50,38 +127,80 @@ class StockstatsUtils:
             end_date = end_date.strftime("%Y-%m-%d")
 
             # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
+            config = get_dataflows_config()
+            cache_dir = os.path.join(config.data_cache_dir, "price_history")
+            os.makedirs(cache_dir, exist_ok=True)
 
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
+            data = update_price_history(
+                symbol,
+                os.path.join(cache_dir, f"{symbol}.csv"),
+                start_date,
+                end_date,
             )
 
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
+            df = wrap(data)
+            df.index = pd.DatetimeIndex(df["Date"]).normalize()
+
+        return df
+
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        df = StockstatsUtils.load_stock_data(symbol, data_dir, online)
+        curr_ts = pd.Timestamp(curr_date).normalize()
+
+        with StockstatsUtils._lock:
+            df[indicator]  # trigger stockstats to calculate the indicator
+            matching_rows = df[df.index == curr_ts]
+
+            if not matching_rows.empty:
+                indicator_value = matching_rows[indicator].values[0]
+                return indicator_value
             else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
+                return "N/A: Not a trading day (weekend or holiday)"
 
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        start_date: Annotated[str, "start date of the window, YYYY-mm-dd"],
+        end_date: Annotated[str, "end date of the window, YYYY-mm-dd"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> dict:
+        """Return {YYYY-mm-dd: indicator value} for every trading day in the window."""
+        df = StockstatsUtils.load_stock_data(symbol, data_dir, online)
 
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+        start_ts = pd.Timestamp(start_date)
+        end_ts = pd.Timestamp(end_date)
 
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
-            return indicator_value
-        else:
-            return "N/A: Not a trading day (weekend or holiday)"
+        with StockstatsUtils._lock:
+            df[indicator]  # trigger stockstats to calculate the indicator
+            window = df.loc[(df.index >= start_ts) & (df.index <= end_ts), indicator]
+        # only the rows inside the window get formatted back to strings
+        window.index = window.index.strftime("%Y-%m-%d")
+
+        return window.to_dict()
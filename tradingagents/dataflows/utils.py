@@ -1,11 +1,32 @@
 import os
 import json
+import threading
+import time
 import pandas as pd
+import requests
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import date, timedelta, datetime
+from functools import wraps
 from typing import Annotated
+from tenacity import (
+    retry,
+    retry_if_exception,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 
 SavePathType = Annotated[str, "File path to save data. If None, data is not saved."]
 
+# network failures worth retrying; lookups for unknown symbols and the like are not
+TRANSIENT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
 def save_output(data: pd.DataFrame, tag: str, save_path: SavePathType = None) -> None:
     if save_path:
         data.to_csv(save_path)
@@ -26,6 +47,180 @@ def decorate_all_methods(decorator):
     return class_decorator
 
 
+def ttl_cache(maxsize: int = 512, ttl: float = 3600):
+    """Memoize a function's results for ttl seconds, keeping at most maxsize entries."""
+
+    def decorator(func):
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                entry = cache.get(key)
+                if entry is not None and entry[1] > now:
+                    cache.move_to_end(key)
+                    return entry[0]
+
+            value = func(*args, **kwargs)
+
+            with lock:
+                cache[key] = (value, now + ttl)
+                cache.move_to_end(key)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+
+        def cache_clear():
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+def singleflight(func):
+    """Let concurrent calls with the same arguments share a single in-flight execution."""
+    inflight = {}
+    lock = threading.Lock()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        with lock:
+            future = inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                inflight[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with lock:
+                inflight.pop(key, None)
+
+        future.set_result(result)
+        return result
+
+    return wrapper
+
+
+def _log_retry(retry_state):
+    print(
+        f"Retrying {retry_state.fn.__name__} after {retry_state.outcome.exception()!r} "
+        f"(attempt {retry_state.attempt_number})"
+    )
+
+
+def retry_transient(max_attempts: int = 3, base: float = 0.2, retry_on=TRANSIENT_ERRORS):
+    """
+    Retry transient failures, sleeping uniform(0, base * 2**attempt) seconds between attempts.
+    retry_on is a tuple of exception types, or a predicate taking the raised exception.
+    """
+    return retry(
+        retry=(
+            retry_if_exception_type(retry_on)
+            if isinstance(retry_on, tuple)
+            else retry_if_exception(retry_on)
+        ),
+        wait=wait_random_exponential(multiplier=base),
+        stop=stop_after_attempt(max_attempts),
+        before_sleep=_log_retry,
+        reraise=True,
+    )
+
+
+class CircuitBreaker:
+    """
+    Fails fast on a data source that is known to be down.
+    After threshold consecutive failures the source is open for cooldown seconds,
+    then a single probe call is let through (half-open) to test whether it recovered.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 60):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = {}
+        self._opened_at = {}
+        self._lock = threading.Lock()
+
+    def is_open(self, name: str) -> bool:
+        with self._lock:
+            if self._failures.get(name, 0) < self.threshold:
+                return False
+            now = time.monotonic()
+            if now - self._opened_at[name] >= self.cooldown:
+                # half-open: let this call probe, keep everyone else out until it reports back
+                self._opened_at[name] = now
+                print(f"Circuit for {name} half-open, probing")
+                return False
+            return True
+
+    def record_success(self, name: str) -> None:
+        with self._lock:
+            if self._failures.pop(name, 0) >= self.threshold:
+                print(f"Circuit for {name} closed")
+            self._opened_at.pop(name, None)
+
+    def record_failure(self, name: str) -> None:
+        with self._lock:
+            failures = self._failures.get(name, 0) + 1
+            self._failures[name] = failures
+            if failures >= self.threshold:
+                if failures == self.threshold:
+                    print(f"Circuit for {name} opened after {failures} consecutive failures")
+                self._opened_at[name] = time.monotonic()
+
+
+circuit_breaker = CircuitBreaker()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a data source whose circuit is open."""
+
+
+def guarded_by_circuit(name: str, failure_on=TRANSIENT_ERRORS):
+    """
+    Fail fast with CircuitOpenError while the named source is down, and report each call's outcome.
+    Only errors matching failure_on (a tuple of exception types, or a predicate) count as the source
+    failing; anything else, e.g. an unknown symbol, passes through without touching the circuit.
+    """
+    is_failure = (
+        (lambda exc: isinstance(exc, failure_on))
+        if isinstance(failure_on, tuple)
+        else failure_on
+    )
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if circuit_breaker.is_open(name):
+                raise CircuitOpenError(f"{name} is failing, skipping the request until it recovers")
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if is_failure(e):
+                    circuit_breaker.record_failure(name)
+                raise
+            circuit_breaker.record_success(name)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
 def get_next_weekday(date):
 
     if not isinstance(date, datetime):
@@ -1,12 +1,72 @@
 # gets data/stats
 
-import yfinance as yf
 from typing import Annotated, Callable, Any, Optional
 from pandas import DataFrame
 import pandas as pd
 from functools import wraps
 
-from .utils import save_output, SavePathType, decorate_all_methods
+from .utils import (
+    save_output,
+    SavePathType,
+    decorate_all_methods,
+    guarded_by_circuit,
+    retry_transient,
+    singleflight,
+    ttl_cache,
+    TRANSIENT_ERRORS,
+)
+
+# yfinance is imported inside the functions that use it, so importing the
+# dataflows doesn't pay for it until a Yahoo Finance tool actually runs
+
+
+def __getattr__(name):
+    # keep yfin_utils.yf available to existing callers
+    if name == "yf":
+        import yfinance
+
+        return yfinance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def is_yf_transient(exc: BaseException) -> bool:
+    """Network failures and Yahoo Finance rate limiting are worth retrying."""
+    from yfinance.exceptions import YFRateLimitError
+
+    return isinstance(exc, TRANSIENT_ERRORS + (YFRateLimitError,))
+
+
+@ttl_cache(maxsize=512, ttl=3600)
+@singleflight
+@guarded_by_circuit("yfinance", failure_on=is_yf_transient)
+@retry_transient(retry_on=is_yf_transient)
+def get_ticker_info(symbol: Annotated[str, "ticker symbol"]) -> dict:
+    """Fetch yf.Ticker(symbol).info, memoized since company details rarely change intraday."""
+    import yfinance as yf
+
+    return yf.Ticker(symbol).info
+
+
+@guarded_by_circuit("yfinance", failure_on=is_yf_transient)
+@retry_transient(retry_on=is_yf_transient)
+def get_ticker_history(
+    symbol: Annotated[str, "ticker symbol"], *args, **kwargs
+) -> DataFrame:
+    """Fetch yf.Ticker(symbol).history(...), retrying transient network failures."""
+    import yfinance as yf
+
+    return yf.Ticker(symbol).history(*args, **kwargs)
+
+
+@guarded_by_circuit("yfinance", failure_on=is_yf_transient)
+@retry_transient(retry_on=is_yf_transient)
+def download_history(
+    symbol: Annotated[str, "ticker symbol"], *args, **kwargs
+) -> DataFrame:
+    """Fetch yf.download(symbol, ...), retrying transient network failures."""
+    import yfinance as yf
+
+    return yf.download(symbol, *args, **kwargs)
 
 
 def init_ticker(func: Callable) -> Callable:
@@ -14,6 +74,8 @@ def init_ticker(func: Callable) -> Callable:
 
     @wraps(func)
     def wrapper(symbol: Annotated[str, "ticker symbol"], *args, **kwargs) -> Any:
+        import yfinance as yf
+
         ticker = yf.Ticker(symbol)
         return func(ticker, *args, **kwargs)
 
@@ -47,7 +109,7 @@ class YFinanceUtils:
     ) -> dict:
         """Fetches and returns latest stock information."""
         ticker = symbol
-        stock_info = ticker.info
+        stock_info = dict(get_ticker_info(ticker.ticker))
         return stock_info
 
     def get_company_info(
@@ -56,7 +118,7 @@ class YFinanceUtils:
     ) -> DataFrame:
         """Fetches and returns company information as a DataFrame."""
         ticker = symbol
-        info = ticker.info
+        info = get_ticker_info(ticker.ticker)
         company_info = {
             "Company Name": info.get("shortName", "N/A"),
             "Industry": info.get("industry", "N/A"),
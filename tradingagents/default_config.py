@@ -1,6 +1,8 @@
 import os
+from types import MappingProxyType
 
-DEFAULT_CONFIG = {
+# read-only; copy it before making changes, e.g. config = DEFAULT_CONFIG.copy()
+DEFAULT_CONFIG = MappingProxyType({
     "project_dir": os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
     "results_dir": os.getenv("TRADINGAGENTS_RESULTS_DIR", "./results"),
     "data_dir": "/Users/yluo/Documents/Code/ScAI/FR1-data",
@@ -8,6 +10,7 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
         "dataflows/data_cache",
     ),
+    "cache_ttl_seconds": 90 * 86400,
     # LLM settings
     "llm_provider": "openai",
     "deep_think_llm": "o4-mini",
@@ -19,4 +22,4 @@ DEFAULT_CONFIG = {
     "max_recur_limit": 100,
     # Tool settings
     "online_tools": True,
-}
+})